@@ -1,16 +1,26 @@
 import dash
 from dash import dcc, html, Input, Output
 import dash_bootstrap_components as dbc
+from flask_compress import Compress
 import webbrowser
 import threading
 import time
 
+# Pages de l'application : importées une seule fois, au démarrage du serveur
+# (chargement des données et pré-calculs compris), et non à la première navigation
+from pages import accueil, dashboard_oeuvres, carte_musees
+
 # Création de l'application principale
 app = dash.Dash(__name__, 
                 external_stylesheets=[dbc.themes.COSMO], 
                 suppress_callback_exceptions=True)
 app.title = "ArtVision Explorer - Plateforme Principale"
 
+# Compression des réponses (layouts, figures JSON des callbacks, assets) :
+# brotli si le navigateur le supporte, gzip sinon
+app.server.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+Compress(app.server)
+
 # Layout principal avec navigation
 # Layout principal avec navigation
 app.layout = html.Div([
@@ -47,35 +57,38 @@ app.layout = html.Div([
 ])
 
 
-# Import et enregistrement des callbacks
-try:
-    from pages.dashboard_oeuvres import register_callbacks as register_dashboard_callbacks
-    from pages.carte_musees import register_callbacks as register_carte_callbacks
-    
-    # Enregistrer tous les callbacks au démarrage
-    register_dashboard_callbacks(app)
-    register_carte_callbacks(app)
-except ImportError as e:
-    print(f"Warning: Could not import callback modules: {e}")
+# Enregistrer tous les callbacks au démarrage
+dashboard_oeuvres.register_callbacks(app)
+carte_musees.register_callbacks(app)
+
+# Layout de chaque page, indexé par son chemin : soit un layout, soit une fonction
+# qui le construit au premier affichage de la page
+_LAYOUTS = {
+    '/accueil': accueil.layout,
+    '/dashboard-oeuvres': dashboard_oeuvres.get_layout,
+    '/carte-musees': carte_musees.layout,
+}
 
 # Callback pour la navigation
+# (l'URL est aussi mise à jour par le dashboard, d'où allow_duplicate)
 @app.callback(
     Output('page-content', 'children'),
-    [Input('url', 'pathname')]
+    Output('url', 'pathname', allow_duplicate=True),
+    Input('url', 'pathname'),
+    prevent_initial_call='initial_duplicate'
 )
 def display_page(pathname):
-    if pathname == '/dashboard-oeuvres' or pathname.startswith('/dashboard-oeuvres/'):
-        from pages.dashboard_oeuvres import layout
-        return layout
-    elif pathname == '/carte-musees':
-        from pages.carte_musees import layout
-        return layout
-    elif pathname == '/accueil':
-        from pages.accueil import layout
-        return layout
-    else:
-        # Redirection automatique vers /accueil pour la racine et routes inconnues
-        return dcc.Location(pathname="/accueil", id="redirect")
+    # Les pages de domaine (/dashboard-oeuvres/<domaine>) utilisent le layout du dashboard
+    if pathname.startswith('/dashboard-oeuvres/'):
+        pathname = '/dashboard-oeuvres'
+    layout = _LAYOUTS.get(pathname.rstrip('/'))
+    if layout is None:
+        # Racine et routes inconnues : affiche directement l'accueil et corrige l'URL,
+        # sans passer par un composant de redirection ni un second appel du callback
+        return accueil.layout, '/accueil'
+    if callable(layout):
+        layout = layout()
+    return layout, dash.no_update
     
 if __name__ == '__main__':    
     
@@ -3,19 +3,26 @@
 # -------------------------------
 
 # Manipulation de données
+import numpy as np
 import pandas as pd
+import pyarrow.csv as pacsv  # Lecture CSV multithreadée
 
 # Visualisation interactive
 import plotly.express as px
 
 # Composants Dash (interface web interactive)
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc  # Thème Bootstrap
 
 # Gestion de fichiers et chemins
 from pathlib import Path
 
+# Mémorisation des données chargées et des figures déjà calculées
+import functools
+
 # Normalisation de texte (accents, caractères spéciaux)
+import re
 import unicodedata
 
 # Interactions système (optionnel ici)
@@ -26,6 +33,10 @@ import os
 # 🔧 FONCTIONS UTILITAIRES
 # -------------------------------
 
+# Suites de caractères spéciaux (underscores compris) : remplacées par un seul underscore
+_PUNCT_RE = re.compile(r"[ /<>\-.,;:()'\"_]+")
+
+
 def _normalize_col(name: str) -> str:
     """
     Nettoie et standardise un nom de colonne :
@@ -36,48 +47,50 @@ def _normalize_col(name: str) -> str:
     Utile pour éviter les erreurs d’accès aux colonnes dans les données.
     """
     s = str(name)
-    s = unicodedata.normalize("NFKD", s)  # Décompose les caractères accentués
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))  # Supprime les accents
-    s = s.lower().strip()
-    for ch in (" ", "/", ">", "-", ".", ",", ";", ":", "(", ")", "'", '"'):
-        s = s.replace(ch, "_")
-    parts = [p for p in s.split("_") if p]  # Élimine les parties vides
-    return "_".join(parts)
-
-
-def parse_location(loc):
-    """
-    Analyse une chaîne de type "Musée du Louvre, Paris, France"
-    et la décompose en : pays, ville, musée.
-    - Gère les chaînes mal formatées ou manquantes.
-    - Retourne une série Pandas nommée avec les 3 champs.
-    """
-    if pd.isna(loc):
-        return pd.Series({"pays": None, "ville": None, "musee": None})
-    
-    parts = [p.strip() for p in loc.split(",")]
-    if len(parts) >= 2:
-        musee = parts[0]
-        ville = parts[1]
-        pays = parts[2] if len(parts) >= 3 else None
-    elif len(parts) == 1:
-        musee = parts[0]
-        ville = None
-        pays = None
-    else:
-        musee = ville = pays = None
-    return pd.Series({"pays": pays, "ville": ville, "musee": musee})
+    if not s.isascii():  # Un nom purement ASCII n'a aucun accent à retirer
+        if not unicodedata.is_normalized("NFKD", s):
+            s = unicodedata.normalize("NFKD", s)  # Décompose les caractères accentués
+        s = "".join(ch for ch in s if not unicodedata.combining(ch))  # Supprime les accents
+    s = _PUNCT_RE.sub("_", s.lower().strip())  # Remplace et fusionne en une seule passe
+    return s.strip("_")  # Élimine les parties vides
 
 
 # -------------------------------
 # 🔹 CHARGEMENT ET PRÉPARATION DES DONNÉES
 # -------------------------------
 
+# Colonnes (noms normalisés) utilisées par la page : les autres ne sont pas lues du CSV
+USED_COLUMNS = {"lieu_de_conservation", "domaine", "artiste", "titre_ou_designation", "latitude", "longitude"}
+
+def _read_csv_arrow(path, usecols=None):
+    """
+    Lit un CSV ';' avec le lecteur multithreadé de PyArrow puis le convertit en DataFrame.
+    Les noms de colonnes sont repris de l'en-tête lu par pandas (doublons suffixés en '.1'),
+    et les cellules vides deviennent des valeurs manquantes comme avec pd.read_csv.
+    """
+    header = pd.read_csv(path, sep=";", encoding="utf-8", nrows=0).columns.tolist()
+    include = [c for c in header if usecols(c)] if usecols else []
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(column_names=header, skip_rows=1, use_threads=True),
+        parse_options=pacsv.ParseOptions(delimiter=";"),
+        convert_options=pacsv.ConvertOptions(include_columns=include, strings_can_be_null=True),
+    )
+    return table.to_pandas()
+
+
+@functools.cache
 def load_data():
     """
     Charge le fichier 'cleaneddata_geocoded_villes.csv' en essayant plusieurs emplacements.
     - Gère les erreurs de fichier manquant.
+    - Ne lit que les colonnes utiles à la page (USED_COLUMNS).
     - Nettoie et convertit les colonnes de coordonnées géographiques (latitude/longitude).
+    - Remplace les valeurs manquantes (pays, ville, domaine, artiste, titre) par des libellés
+      par défaut et stocke pays, ville, domaine et artiste en catégories.
+    - Met en cache le résultat dans un fichier '.parquet' voisin du CSV : tant que le CSV
+      n'est pas modifié, les lancements suivants relisent ce cache au lieu de reparser le CSV.
+    - Mémorise le résultat en mémoire : les appels suivants retournent le même DataFrame.
     """
     # Chemins possibles vers le fichier de données
     project_root = Path(__file__).resolve().parent.parent
@@ -89,65 +102,125 @@ def load_data():
         Path("./data/cleaned_oeuvres.csv"),
     ]
 
-    last_error = None
-    for p in candidates:
-        try:
-            if p.exists():
-                df = pd.read_csv(p, sep=";", encoding="utf-8")
-                break
-        except Exception as e:
-            last_error = e
-            continue
-    else:
+    # Premier emplacement existant (les erreurs de lecture ne sont plus masquées)
+    csv_path = next((p for p in candidates if p.exists()), None)
+    if csv_path is None:
         # Si aucun fichier n’est trouvé, affiche un message d’erreur détaillé
         tried = ", ".join(str(p) for p in candidates)
-        msg = "Fichier 'cleaneddata_geocoded_villes.csv' introuvable. Chemins testés: " + tried
-        if last_error:
-            msg += f"; dernière erreur: {last_error}"
-        raise FileNotFoundError(msg)
+        raise FileNotFoundError("Fichier 'cleaneddata_geocoded_villes.csv' introuvable. Chemins testés: " + tried)
+
+    parquet_path = csv_path.with_suffix(".parquet")
+    # Cache à jour (plus récent que le CSV et que ce module, qui définit le
+    # traitement des données) → lecture colonne par colonne, sans parsing
+    source_mtime = max(csv_path.stat().st_mtime, Path(__file__).stat().st_mtime)
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= source_mtime:
+        try:
+            return pd.read_parquet(parquet_path, engine="pyarrow")
+        except Exception as e:
+            print(f"Warning: cache '{parquet_path}' illisible, relecture du CSV ({e})")
+    df = _read_csv_arrow(csv_path, usecols=lambda c: _normalize_col(c) in USED_COLUMNS)
 
     # Normalise les noms des colonnes
     df.columns = [_normalize_col(c) for c in df.columns]
 
     # Convertit latitude/longitude en numérique, ou crée des colonnes vides si absentes
+    # (float32 : une précision d'environ 0,5 m suffit pour placer une ville sur la carte)
     if "latitude" in df.columns:
-        df["latitude"] = pd.to_numeric(df["latitude"], errors="coerce")
+        df["latitude"] = pd.to_numeric(df["latitude"], errors="coerce").astype("float32")
     else:
         df["latitude"] = pd.NA
     if "longitude" in df.columns:
-        df["longitude"] = pd.to_numeric(df["longitude"], errors="coerce")
+        df["longitude"] = pd.to_numeric(df["longitude"], errors="coerce").astype("float32")
     else:
         df["longitude"] = pd.NA
 
+    # Extraction des informations géographiques si la colonne "lieu_de_conservation" existe :
+    # une chaîne "Musée du Louvre, Paris, France" est découpée en une seule passe vectorisée
+    # en musée, ville, pays (valeurs manquantes si la chaîne compte moins de segments).
+    if "lieu_de_conservation" in df.columns:
+        parts = df["lieu_de_conservation"].str.split(",", n=3, expand=True)
+        for i, col in enumerate(("musee", "ville", "pays")):
+            df[col] = parts[i].str.strip() if i in parts.columns else None
+        # La chaîne brute n'est plus utilisée une fois découpée : inutile de la garder en mémoire
+        df = df.drop(columns="lieu_de_conservation")
+    else:
+        # Si la colonne n’existe pas, on crée des valeurs par défaut
+        df["pays"] = "Inconnu"
+        df["ville"] = "Inconnu"
+        df["musee"] = "Inconnu"
+
+    # Nettoyage des données manquantes pour éviter les erreurs dans les graphiques
+    # (en place : le DataFrame est encore local à cette fonction, inutile de le copier)
+    df.fillna({
+        "pays": "Pays inconnu",
+        "ville": "Ville inconnue",
+        "domaine": "Domaine inconnu",
+        "artiste": "Artiste inconnu",
+        "titre_ou_designation": "Œuvre sans titre",
+    }, inplace=True)
+
+    # Colonnes textuelles très répétées en catégories : filtres, comptages et regroupements
+    # travaillent sur des codes entiers, et .cat.categories donne les valeurs triées sans doublon
+    df = df.astype({col: "category" for col in ("pays", "ville", "domaine", "artiste")})
+
+    # Sauvegarde du cache Parquet (un échec d'écriture n'empêche pas l'application de démarrer)
+    try:
+        df.to_parquet(csv_path.with_suffix(".parquet"), engine="pyarrow", compression="zstd")
+    except Exception as e:
+        print(f"Warning: impossible d'écrire le cache Parquet: {e}")
+
     return df
 
 
-# Chargement des données
+# Chargement des données (déjà nettoyées et typées par load_data, qui garantit aussi
+# la présence des colonnes latitude/longitude) ; le DataFrame mémorisé n'est pas modifié
 df = load_data()
-df.columns = [_normalize_col(c) for c in df.columns]  # Répète la normalisation au cas où
-
-# Extraction des informations géographiques si la colonne "lieu_de_conservation" existe
-if "lieu_de_conservation" in df.columns:
-    df[["pays", "ville", "musee"]] = df["lieu_de_conservation"].apply(parse_location)
-else:
-    # Si la colonne n’existe pas, on crée des valeurs par défaut
-    df["pays"] = "Inconnu"
-    df["ville"] = "Inconnu"
-    df["musee"] = "Inconnu"
-
-# Nettoyage des données manquantes pour éviter les erreurs dans les graphiques
-df_clean = df.copy()
-df_clean["pays"] = df_clean["pays"].fillna("Pays inconnu")
-df_clean["ville"] = df_clean["ville"].fillna("Ville inconnue")
-df_clean["domaine"] = df_clean["domaine"].fillna("Domaine inconnu")
-df_clean["artiste"] = df_clean["artiste"].fillna("Artiste inconnu")
-df_clean["titre_ou_designation"] = df_clean["titre_ou_designation"].fillna("Œuvre sans titre")
-
-# Vérifie que les coordonnées géographiques existent (valeurs par défaut = Paris)
-if "latitude" not in df_clean.columns:
-    df_clean["latitude"] = 48.8566  # Latitude de Paris
-if "longitude" not in df_clean.columns:
-    df_clean["longitude"] = 2.3522  # Longitude de Paris
+df_clean = df
+
+# Pré-calculs réutilisés à chaque callback (les données ne changent plus après le chargement).
+# Les callbacks filtrent ces tables agrégées, bien plus petites que df_clean ;
+# leurs colonnes sont repassées en texte : plotly express regroupe lui-même les colonnes
+# qu'on lui donne, et des catégories lui feraient produire toutes les combinaisons possibles.
+# - nombre d'œuvres par point de la carte et par domaine (les coordonnées manquantes sont
+#   gardées pour le Top domaines), trié une fois pour toutes dans l'ordre des points de la carte
+_CITY_AGG = (
+    df_clean.groupby(["pays", "domaine", "ville", "latitude", "longitude"], observed=True, dropna=False)
+    .size()
+    .astype("int32")
+    .reset_index(name="count")
+    .astype({"pays": object, "domaine": object, "ville": object})
+    .sort_values(["ville", "pays", "latitude", "longitude"], ignore_index=True)
+)
+# - la hiérarchie du sunburst : une ligne par feuille avec son nombre d'œuvres
+SUNBURST_AGG = (
+    df_clean.groupby(["pays", "ville", "domaine", "artiste", "titre_ou_designation"], sort=False, observed=True)
+    .size()
+    .astype("int32")
+    .reset_index(name="count")
+    .astype({"pays": object, "ville": object, "domaine": object, "artiste": object})
+)
+
+# Options des filtres par domaine et par pays (catégories déjà triées et dédoublonnées)
+_DOMAIN_OPTIONS = [{"label": d, "value": d} for d in df_clean["domaine"].cat.categories]
+_COUNTRY_OPTIONS = [{"label": p, "value": p} for p in df_clean["pays"].cat.categories]
+
+# Artistes génériques exclus du détail d'une ville (comparaison insensible à la casse) :
+# repérés une seule fois parmi les catégories, au lieu de passer toute la colonne en minuscules
+_ARTISTES_A_EXCLURE = {"artiste inconnu", "inconnu", "anonyme", "unknown"}
+_ARTISTES_EXCLUS = [a for a in df_clean["artiste"].cat.categories if a.lower() in _ARTISTES_A_EXCLURE]
+
+
+def _filter_mask(table, selected_domains, selected_countries):
+    """
+    Retourne le masque booléen des lignes d'une table agrégée (_CITY_AGG ou SUNBURST_AGG)
+    retenues par les filtres (domaines et pays), sans copier la table.
+    """
+    mask = np.ones(len(table), dtype=bool)
+    if selected_domains:
+        mask &= table["domaine"].isin(selected_domains).values
+    if selected_countries:
+        mask &= table["pays"].isin(selected_countries).values
+    return mask
 
 
 # -------------------------------
@@ -251,7 +324,7 @@ layout = dbc.Container([
                 html.Label("Domaines artistiques", className="fw-bold mb-2"),
                 dcc.Dropdown(
                     id="domain-filter",
-                    options=[{"label": d, "value": d} for d in sorted(df_clean["domaine"].dropna().unique())],
+                    options=_DOMAIN_OPTIONS,
                     multi=True,
                     placeholder="Tous les domaines...",
                     style={"borderRadius": "8px", "border": "2px solid #e9ecef"}
@@ -263,7 +336,7 @@ layout = dbc.Container([
                 html.Label("Pays", className="fw-bold mb-2"),
                 dcc.Dropdown(
                     id="country-filter",
-                    options=[{"label": p, "value": p} for p in sorted(df_clean["pays"].dropna().unique())],
+                    options=_COUNTRY_OPTIONS,
                     multi=True,
                     placeholder="Tous les pays...",
                     style={"borderRadius": "8px", "border": "2px solid #e9ecef"}
@@ -320,7 +393,9 @@ layout = dbc.Container([
                         dcc.Graph(
                             id="sunburst-graph", 
                             style={"height": "400px", "borderRadius": "10px"}
-                        )
+                        ),
+                        # Clé (ville, filtres) du sunburst affiché, propre à chaque navigateur
+                        dcc.Store(id="sunburst-key")
                     ], style={
                         "background": "white",
                         "borderRadius": "15px",
@@ -355,6 +430,189 @@ layout = dbc.Container([
 ], fluid=True, style={"backgroundColor": "#f8f9fa", "minHeight": "100vh"})
 
 
+# -------------------------------
+# 📊 CONSTRUCTION DES FIGURES
+# -------------------------------
+
+def _filter_key(values):
+    """
+    Transforme une sélection de dropdown (liste ou None) en tuple trié,
+    utilisable comme clé de cache.
+    """
+    return tuple(sorted(values)) if values else ()
+
+
+def _sunburst_json(fig_sb):
+    """
+    Applique le style commun des sunbursts et retourne la figure déjà convertie
+    en dictionnaire JSON (Dash l'envoie tel quel, sans reconstruire la figure).
+    """
+    fig_sb.update_layout(
+        margin=dict(l=0, r=0, t=30, b=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig_sb.to_plotly_json()
+
+
+# Figure de repli (constante) lorsque la vue d'ensemble ne peut pas être construite
+_EMPTY_SUNBURST_JSON = _sunburst_json(px.sunburst(
+    names=["Cliquez sur une ville pour voir le détail"],
+    title="Vue d'ensemble des œuvres"
+))
+
+
+@functools.lru_cache(maxsize=8)
+def _sunburst_rows(domains_key, countries_key):
+    """
+    Lignes de SUNBURST_AGG retenues par les filtres. Mémorisé : explorer plusieurs
+    villes avec les mêmes filtres ne refiltre pas la table à chaque clic.
+    """
+    return SUNBURST_AGG[_filter_mask(SUNBURST_AGG, domains_key, countries_key)]
+
+
+@functools.lru_cache(maxsize=256)
+def _build_sunburst(ville_clicked, domains_key, countries_key):
+    """
+    Construit le sunburst pour une ville cliquée (ou la vue globale si None)
+    et des filtres donnés. Le résultat est mémorisé : revenir sur une ville
+    déjà explorée ne reconstruit ni ne resérialise la figure.
+    """
+    # Applique les filtres sur la table agrégée (plotly reçoit une ligne par feuille
+    # avec son effectif, au lieu d'une ligne par œuvre)
+    rows = _sunburst_rows(domains_key, countries_key)
+
+    # Si aucun clic → vue globale
+    if ville_clicked is None:
+        df_filtered = (rows[["pays", "ville", "domaine", "count"]]
+                       .groupby(["pays", "ville", "domaine"], sort=False, as_index=False)["count"].sum())
+        try:
+            fig_sb = px.sunburst(
+                df_filtered,
+                path=["pays", "ville", "domaine"],
+                values="count",
+                title="Répartition par Pays → Ville → Domaine",
+                maxdepth=2
+            )
+        except ValueError:
+            # Cas où les données ne permettent pas le sunburst
+            return _EMPTY_SUNBURST_JSON
+    else:
+        df_city = rows.loc[rows["ville"].values == ville_clicked,
+                           ["domaine", "artiste", "titre_ou_designation", "count"]]
+
+        if df_city.empty:
+            fig_sb = px.sunburst(
+                names=["Aucune œuvre trouvée"],
+                title=f"Aucune donnée pour {ville_clicked}"
+            )
+        else:
+            # Exclut les artistes génériques pour une meilleure lisibilité
+            df_city_filtre = df_city[~df_city["artiste"].isin(_ARTISTES_EXCLUS)]
+
+            # Essaye successivement des niveaux de détail décroissants
+            if len(df_city_filtre) > 0:
+                try:
+                    fig_sb = px.sunburst(
+                        df_city_filtre,
+                        path=["domaine", "artiste", "titre_ou_designation"],
+                        values="count",
+                        title=f"Exploration des œuvres à {ville_clicked} (artistes connus)"
+                    )
+                except ValueError:
+                    try:
+                        fig_sb = px.sunburst(
+                            df_city_filtre,
+                            path=["domaine", "artiste"],
+                            values="count",
+                            title=f"Exploration des œuvres à {ville_clicked} (vue simplifiée)"
+                        )
+                    except ValueError:
+                        fig_sb = px.sunburst(
+                            df_city_filtre,
+                            path=["domaine"],
+                            values="count",
+                            title=f"Répartition par domaine à {ville_clicked}"
+                        )
+            else:
+                # Si tous les artistes sont "inconnus"
+                fig_sb = px.sunburst(
+                    df_city,
+                    path=["domaine", "titre_ou_designation"],
+                    values="count",
+                    title=f"Répartition par domaine à {ville_clicked} (artistes non spécifiés)"
+                )
+
+    return _sunburst_json(fig_sb)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_map_and_bar(domains_key, countries_key):
+    """
+    Construit la carte des musées et le Top 10 des domaines pour des filtres donnés,
+    sous forme de dictionnaires JSON. Le résultat est mémorisé : revenir à une
+    combinaison de filtres déjà affichée ne reconstruit pas les figures.
+    """
+    # Filtre la table pré-agrégée (une ligne par point et par domaine)
+    df_city = _CITY_AGG[_filter_mask(_CITY_AGG, domains_key, countries_key)]
+
+    # Agrège les données par ville pour la carte : somme des effectifs de chaque point
+    # (table déjà triée par point : sort=False évite de retrier les groupes à chaque appel)
+    df_grouped = (df_city.groupby(["ville", "pays", "latitude", "longitude"], sort=False)["count"]
+                  .sum().astype("int32").reset_index())
+    # Coordonnées stockées en float32 : arrondies à 6 décimales pour la figure, sinon leur
+    # conversion en float64 ajoute des chiffres parasites (et du volume) au JSON envoyé
+    df_grouped[["latitude", "longitude"]] = df_grouped[["latitude", "longitude"]].astype("float64").round(6)
+
+    # 🌍 Carte interactive
+    fig_map = px.scatter_mapbox(
+        df_grouped,
+        lat="latitude",
+        lon="longitude",
+        hover_name="ville",
+        hover_data={"pays": True, "count": True, "ville": False},
+        size="count",
+        size_max=20,
+        zoom=2,
+        height=500,
+        color="count",
+        color_continuous_scale=px.colors.sequential.Viridis,
+        title=""
+    )
+    fig_map.update_layout(
+        mapbox_style="carto-positron",  # Style clair
+        margin=dict(l=0, r=0, t=0, b=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        coloraxis_colorbar=dict(
+            title="Nombre d'œuvres",
+            title_font=dict(size=12, color="#495057"),
+            tickfont=dict(size=10, color="#495057")
+        )
+    )
+
+    # 📊 Barres horizontales : Top 10 domaines (sélection partielle, sans trier tous les domaines) ;
+    # en cas d'égalité, nlargest garde l'ordre de l'index du groupby, déjà alphabétique
+    domain_counts = df_city.groupby("domaine")["count"].sum().nlargest(10)
+    fig_bar = px.bar(
+        x=domain_counts.values,
+        y=domain_counts.index,
+        orientation='h',
+        color=domain_counts.values,
+        color_continuous_scale=px.colors.sequential.Viridis
+    )
+    fig_bar.update_layout(
+        margin=dict(l=0, r=0, t=0, b=0),
+        xaxis_title="Nombre d'œuvres",
+        yaxis_title="",
+        showlegend=False,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+
+    return fig_map.to_plotly_json(), fig_bar.to_plotly_json()
+
+
 # -------------------------------
 # 🔁 CALLBACKS : LOGIQUE DYNAMIQUE
 # -------------------------------
@@ -378,150 +636,31 @@ def register_callbacks(app):
         - La carte des musées (taille = nombre d’œuvres par ville)
         - Le graphique en barres horizontales (Top 10 domaines)
         """
-        df_filtered = df_clean.copy()
-        
-        # Applique les filtres
-        if selected_domains:
-            df_filtered = df_filtered[df_filtered["domaine"].isin(selected_domains)]
-        if selected_countries:
-            df_filtered = df_filtered[df_filtered["pays"].isin(selected_countries)]
-
-        # Agrège les données par ville pour la carte
-        df_grouped = df_filtered.groupby(["ville", "pays", "latitude", "longitude"]).size().reset_index(name="count")
-
-        # 🌍 Carte interactive
-        fig_map = px.scatter_mapbox(
-            df_grouped,
-            lat="latitude",
-            lon="longitude",
-            hover_name="ville",
-            hover_data={"pays": True, "count": True, "ville": False},
-            size="count",
-            size_max=20,
-            zoom=2,
-            height=500,
-            color="count",
-            color_continuous_scale=px.colors.sequential.Viridis,
-            title=""
-        )
-        fig_map.update_layout(
-            mapbox_style="carto-positron",  # Style clair
-            margin=dict(l=0, r=0, t=0, b=0),
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            coloraxis_colorbar=dict(
-                title="Nombre d'œuvres",
-                title_font=dict(size=12, color="#495057"),
-                tickfont=dict(size=10, color="#495057")
-            )
-        )
-
-        # 📊 Barres horizontales : Top 10 domaines
-        domain_counts = df_filtered["domaine"].value_counts().head(10)
-        fig_bar = px.bar(
-            x=domain_counts.values,
-            y=domain_counts.index,
-            orientation='h',
-            color=domain_counts.values,
-            color_continuous_scale=px.colors.sequential.Viridis
-        )
-        fig_bar.update_layout(
-            margin=dict(l=0, r=0, t=0, b=0),
-            xaxis_title="Nombre d'œuvres",
-            yaxis_title="",
-            showlegend=False,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-        )
-
-        return fig_map, fig_bar
+        return _build_map_and_bar(_filter_key(selected_domains), _filter_key(selected_countries))
 
 
     # Callback pour le graphique Sunburst (interactif au clic sur une ville)
     @app.callback(
-        Output("sunburst-graph", "figure"),
+        [Output("sunburst-graph", "figure"),
+         Output("sunburst-key", "data")],
         [Input("museum-map", "clickData"),          # Données du clic sur la carte
          Input("domain-filter", "value"),           # Filtre domaine
-         Input("country-filter", "value")]          # Filtre pays
+         Input("country-filter", "value")],         # Filtre pays
+        [State("sunburst-key", "data")]             # Clé du sunburst déjà affiché
     )
-    def update_sunburst(clickData, selected_domains, selected_countries):
+    def update_sunburst(clickData, selected_domains, selected_countries, last_key):
         """
         Affiche une hiérarchie des œuvres :
         - Vue globale par défaut (pays → ville → domaine)
         - Vue détaillée par ville si un point est cliqué
         """
-        df_filtered = df_clean.copy()
-        
-        # Applique les filtres
-        if selected_domains:
-            df_filtered = df_filtered[df_filtered["domaine"].isin(selected_domains)]
-        if selected_countries:
-            df_filtered = df_filtered[df_filtered["pays"].isin(selected_countries)]
-
-        # Si aucun clic → vue globale
-        if not clickData:
-            try:
-                fig_sb = px.sunburst(
-                    df_filtered,
-                    path=["pays", "ville", "domaine"],
-                    title="Répartition par Pays → Ville → Domaine",
-                    maxdepth=2
-                )
-            except ValueError:
-                # Cas où les données ne permettent pas le sunburst
-                fig_sb = px.sunburst(
-                    names=["Cliquez sur une ville pour voir le détail"],
-                    title="Vue d'ensemble des œuvres"
-                )
-        else:
-            # Récupère la ville cliquée
-            ville_clicked = clickData["points"][0]["hovertext"]
-            df_city = df_filtered[df_filtered["ville"] == ville_clicked]
-
-            if df_city.empty:
-                fig_sb = px.sunburst(
-                    names=["Aucune œuvre trouvée"],
-                    title=f"Aucune donnée pour {ville_clicked}"
-                )
-            else:
-                # Exclut les artistes génériques pour une meilleure lisibilité
-                artistes_a_exclure = ["Artiste inconnu", "inconnu", "anonyme", "Anonyme", "Unknown", "unknown"]
-                df_city_filtre = df_city[~df_city["artiste"].str.lower().isin([a.lower() for a in artistes_a_exclure])]
-
-                # Essaye successivement des niveaux de détail décroissants
-                if len(df_city_filtre) > 0:
-                    try:
-                        fig_sb = px.sunburst(
-                            df_city_filtre,
-                            path=["domaine", "artiste", "titre_ou_designation"],
-                            title=f"Exploration des œuvres à {ville_clicked} (artistes connus)"
-                        )
-                    except ValueError:
-                        try:
-                            fig_sb = px.sunburst(
-                                df_city_filtre,
-                                path=["domaine", "artiste"],
-                                title=f"Exploration des œuvres à {ville_clicked} (vue simplifiée)"
-                            )
-                        except ValueError:
-                            fig_sb = px.sunburst(
-                                df_city_filtre,
-                                path=["domaine"],
-                                title=f"Répartition par domaine à {ville_clicked}"
-                            )
-                else:
-                    # Si tous les artistes sont "inconnus"
-                    fig_sb = px.sunburst(
-                        df_city,
-                        path=["domaine", "titre_ou_designation"],
-                        title=f"Répartition par domaine à {ville_clicked} (artistes non spécifiés)"
-                    )
-
-        # Style du sunburst
-        fig_sb.update_layout(
-            margin=dict(l=0, r=0, t=30, b=0),
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-        )
-
-        return fig_sb
\ No newline at end of file
+        # Ville cliquée (None → vue globale) ; les filtres sont triés pour mutualiser le cache
+        ville_clicked = clickData["points"][0]["hovertext"] if clickData else None
+        domains_key, countries_key = _filter_key(selected_domains), _filter_key(selected_countries)
+
+        # Même ville et mêmes filtres que le sunburst affiché (nouveau clic sur la même ville,
+        # filtre vidé...) : inutile de renvoyer la figure au navigateur
+        key = [ville_clicked, list(domains_key), list(countries_key)]
+        if key == last_key:
+            raise PreventUpdate
+        return _build_sunburst(ville_clicked, domains_key, countries_key), key
\ No newline at end of file
@@ -2,18 +2,26 @@
 # Importation des bibliothèques nécessaires pour la création de l'application Dash
 import plotly.express as px
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv  # Lecture CSV multithreadée
 from pathlib import Path
+import re
 import unicodedata
 import dash
-from dash import dcc, html, Input, Output, callback_context
+from dash import dcc, html, Input, Output, State, ALL, callback_context
 import dash_bootstrap_components as dbc
 import numpy as np
 import os
+import functools  # Mémorisation du chargement des données et des figures
+import json
 
 # ----------------------------
 # Fonctions utilitaires et chargement des données
 # ----------------------------
 
+# Motif précompilé : toute suite de caractères spéciaux ou d'underscores devient un seul "_"
+_PUNCT_RE = re.compile(r"[ /<>\-.,;:()'\"_]+")
+
 def _normalize_col(name: str) -> str:
     """
     Normalise un nom de colonne en supprimant les accents,
@@ -21,24 +29,56 @@ def _normalize_col(name: str) -> str:
     et mettant tout en minuscules.
     """
     s = str(name)
-    # Décompose les caractères accentués (e.g., é -> e + accent)
-    s = unicodedata.normalize("NFKD", s)
-    # Supprime les accents
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    # Met en minuscule et retire les espaces en début/fin
-    s = s.lower().strip()
-    # Remplace les caractères spéciaux par des underscores
-    for ch in (" ", "/", ">", "-", ".", ",", ";", ":", "(", ")", "'", '"'):
-        s = s.replace(ch, "_")
-    # Supprime les underscores multiples ou vides
-    parts = [p for p in s.split("_") if p]
-    return "_".join(parts)
+    # Un nom purement ASCII n'a aucun accent : décomposition et filtrage inutiles
+    if not s.isascii():
+        # Décompose les caractères accentués (e.g., é -> e + accent), sauf si déjà décomposé
+        if not unicodedata.is_normalized("NFKD", s):
+            s = unicodedata.normalize("NFKD", s)
+        # Supprime les accents
+        s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    # Met en minuscule, retire les espaces en début/fin et remplace les caractères
+    # spéciaux, en fusionnant les underscores successifs dans la même passe
+    s = _PUNCT_RE.sub("_", s.lower().strip())
+    return s.strip("_")
+
+def _read_csv_arrow(path, usecols=None, dtypes=None):
+    """
+    Lit un CSV ';' avec le lecteur multithreadé de PyArrow puis le convertit en DataFrame.
+    Les noms de colonnes sont repris de l'en-tête lu par pandas (doublons suffixés en '.1'),
+    et les cellules vides deviennent des valeurs manquantes comme avec pd.read_csv.
+    dtypes associe des noms de colonnes normalisés à un type Arrow imposé (sans inférence).
+    Les colonnes texte peu variées (au plus 50 valeurs distinctes) sont dictionnarisées
+    dès la lecture et arrivent en catégories pandas.
+    """
+    header = pd.read_csv(path, sep=";", encoding="utf-8", nrows=0).columns.tolist()
+    include = [c for c in header if usecols(c)] if usecols else []
+    column_types = {c: dtypes[_normalize_col(c)] for c in header if _normalize_col(c) in dtypes} if dtypes else {}
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(column_names=header, skip_rows=1, use_threads=True),
+        parse_options=pacsv.ParseOptions(delimiter=";"),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=include, column_types=column_types, strings_can_be_null=True,
+            auto_dict_encode=True,
+        ),
+    )
+    return table.to_pandas()
 
+# Types imposés à la lecture du CSV (noms normalisés) : le domaine, très répétitif,
+# est lu directement sous forme de dictionnaire (catégorie pandas), sans chaînes intermédiaires.
+# Toutes les colonnes restent lues : elles sont proposées dans l'exploration libre.
+_CSV_DTYPES = {"domaine": pa.dictionary(pa.int32(), pa.string())}
+
+@functools.cache
 def load_data():
     """
     Charge le fichier CSV 'oeuvres.csv' à partir de plusieurs emplacements possibles.
     Normalise les noms des colonnes.
     Filtre les dates pour ne garder que celles <= 2025.
+    Garantit une colonne 'domaine' en catégories ("Aucune donnée" si elle est absente du CSV).
+    Le résultat est mis en cache dans 'oeuvres.parquet' (à côté du CSV) et relu
+    directement tant que le CSV n'a pas été modifié. En mémoire, l'appel est mémorisé :
+    les appels suivants retournent le même DataFrame sans relire le disque.
     """
     # Détermine le répertoire racine du projet
     project_root = Path(__file__).resolve().parent.parent
@@ -51,22 +91,23 @@ def load_data():
         Path("/data/oeuvres.csv"),
     ]
 
-    last_error = None
-    for p in candidates:
-        try:
-            if p.exists():
-                df = pd.read_csv(p, sep=";", encoding="utf-8")
-                break
-        except Exception as e:
-            last_error = e
-            continue
-    else:
+    # Premier chemin existant ; une erreur de lecture de ce fichier remonte telle quelle
+    csv_path = next((p for p in candidates if p.exists()), None)
+    if csv_path is None:
         # Si aucun fichier n'a été trouvé, lève une erreur
         tried = ", ".join(str(p) for p in candidates)
-        msg = f"Fichier 'oeuvres.csv' introuvable. Chemins testés: {tried}."
-        if last_error:
-            msg += f" Dernière erreur lors de la lecture: {last_error}"
-        raise FileNotFoundError(msg)
+        raise FileNotFoundError(f"Fichier 'oeuvres.csv' introuvable. Chemins testés: {tried}.")
+
+    parquet_path = csv_path.with_suffix(".parquet")
+    # Si le cache Parquet est plus récent que le CSV et que ce module
+    # (qui définit les types et filtres appliqués), on le relit directement
+    source_mtime = max(csv_path.stat().st_mtime, Path(__file__).stat().st_mtime)
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= source_mtime:
+        try:
+            return pd.read_parquet(parquet_path, engine="pyarrow")
+        except Exception as e:
+            print(f"Warning: cache '{parquet_path}' illisible, relecture du CSV ({e})")
+    df = _read_csv_arrow(csv_path, dtypes=_CSV_DTYPES)
 
     # Normalise les noms de colonnes pour faciliter l'accès
     df.columns = [_normalize_col(c) for c in df.columns]
@@ -77,125 +118,232 @@ def load_data():
             df["date_de_l_oeuvre_ou_de_l_artiste"], errors="coerce"
         )
         df = df[df["date_de_l_oeuvre_ou_de_l_artiste"] <= 2025]
+        # Les dates manquantes ont été écartées par le filtre : années en entiers 32 bits
+        df = df.astype({"date_de_l_oeuvre_ou_de_l_artiste": "int32"})
+
+    # Les domaines (quelques valeurs répétées) sont stockés en catégories :
+    # comparaisons et regroupements se font sur des codes entiers
+    # (catégories triées par ordre alphabétique, quel que soit l'ordre de lecture, et
+    # limitées aux domaines restant après le filtre des dates : le dictionnaire lu dans
+    # le CSV contient aussi ceux dont toutes les œuvres ont été écartées)
+    if "domaine" in df.columns:
+        domaine = df["domaine"].astype("category").cat.remove_unused_categories()
+        df["domaine"] = domaine.cat.reorder_categories(sorted(domaine.cat.categories))
+    else:
+        # Si la colonne 'domaine' n'existe pas, on la crée avec une valeur par défaut
+        df["domaine"] = pd.Series("Aucune donnée", index=df.index, dtype="category")
+    # Même traitement pour les autres colonnes texte très répétitives
+    # (moins de 5 % de valeurs distinctes)
+    text_cols = df.select_dtypes(include="object").columns
+    low_cardinality = [c for c in text_cols if df[c].nunique() < 0.05 * len(df)]
+    df = df.astype({c: "category" for c in low_cardinality})
+
+    # Sauvegarde du cache Parquet (un échec d'écriture n'empêche pas le chargement)
+    try:
+        df.to_parquet(csv_path.with_suffix(".parquet"), engine="pyarrow", compression="zstd")
+    except Exception as e:
+        print(f"Warning: impossible d'écrire le cache Parquet: {e}")
     return df
 
+def year_bounds(dates):
+    """
+    Calcule les bornes (min, max) du slider temporel pour un tableau de dates triées :
+    le 5e percentile arrondi à la centaine inférieure, et la date maximale (<= 2025).
+    Retourne (0, 2025) si le tableau est vide.
+    """
+    if len(dates) == 0:
+        return 0, 2025
+    min_raw = int(np.percentile(dates, 5))
+    return min_raw // 100 * 100, min(int(dates[-1]), 2025)
+
 # Chargement des données au démarrage de l'application
 df = load_data()
 
-# Si la colonne 'domaine' n'existe pas, on la crée avec une valeur par défaut
-if "domaine" not in df.columns:
-    df["domaine"] = "Aucune donnée"
+# Œuvres triées par date (tri stable) : une plage d'années correspond à une tranche
+# contiguë du DataFrame, trouvée par recherche dichotomique au lieu d'un masque booléen
+df = df.sort_values("date_de_l_oeuvre_ou_de_l_artiste", kind="mergesort", ignore_index=True)
+_DATES_SORTED = df["date_de_l_oeuvre_ou_de_l_artiste"].to_numpy()
+
+# Pour chaque domaine : positions de ses lignes et dates correspondantes, déjà triées
+# par date puisque le DataFrame l'est (évite de rescanner la colonne 'domaine')
+_ROWS_BY_DOMAIN = {
+    d: (positions, _DATES_SORTED[positions])
+    for d, positions in df.groupby("domaine", observed=True, sort=False).indices.items()
+}
+_NO_ROWS = (np.empty(0, dtype=np.intp), np.empty(0, dtype=_DATES_SORTED.dtype))
+
+def _year_bounds_idx(dates, lo, hi):
+    """Indices [start, stop) des dates comprises entre lo et hi (inclus) dans un tableau trié."""
+    return np.searchsorted(dates, lo, side="left"), np.searchsorted(dates, hi, side="right")
+
+def _slice_by_year(lo, hi, domaine=None):
+    """
+    Retourne les œuvres dont la date est comprise entre lo et hi (inclus),
+    éventuellement restreintes à un domaine (vide si le domaine est inconnu).
+    Sans domaine, le résultat est une tranche du DataFrame, sans copie.
+    """
+    if domaine is None:
+        start, stop = _year_bounds_idx(_DATES_SORTED, lo, hi)
+        return df.iloc[start:stop]
+    positions, dates = _ROWS_BY_DOMAIN.get(domaine, _NO_ROWS)
+    start, stop = _year_bounds_idx(dates, lo, hi)
+    return df.iloc[positions[start:stop]]
 
-# Récupère la liste des domaines uniques, triés
-domaines = sorted(df["domaine"].dropna().unique())
+def _count_by_year(lo, hi, domaine=None):
+    """Nombre d'œuvres entre lo et hi (inclus), éventuellement pour un seul domaine."""
+    dates = _DATES_SORTED if domaine is None else _ROWS_BY_DOMAIN.get(domaine, _NO_ROWS)[1]
+    start, stop = _year_bounds_idx(dates, lo, hi)
+    return int(stop - start)
+
+# Liste des domaines uniques, triés : ce sont les catégories de la colonne
+domaines = list(df["domaine"].cat.categories)
+
+# Nombre d'œuvres par (domaine, année), calculé une seule fois : les graphiques
+# découpent ces tables par plage d'années au lieu de refiltrer tout le DataFrame
+year_counts = df.groupby(["domaine", "date_de_l_oeuvre_ou_de_l_artiste"], observed=True).size()
+# Matrice dense (domaine × année) du nombre d'œuvres : ligne i = domaines[i],
+# colonne j = année FIRST_YEAR + j ; une plage d'années est une simple tranche
+FIRST_YEAR = int(_DATES_SORTED[0]) if len(_DATES_SORTED) else 0
+_n_years = int(_DATES_SORTED[-1]) - FIRST_YEAR + 1 if len(_DATES_SORTED) else 0
+_codes = df["domaine"].cat.codes.to_numpy().astype(np.int64)
+_known = _codes >= 0
+YEAR_COUNTS_MATRIX = np.bincount(
+    _codes[_known] * _n_years + (_DATES_SORTED[_known] - FIRST_YEAR),
+    minlength=len(domaines) * _n_years,
+).astype(np.int32).reshape(len(domaines), _n_years)
+_DOMAIN_ROW = {d: i for i, d in enumerate(domaines)}
+# (année, domaine) -> nombre d'œuvres, trié par année pour le découpage par plage
+DOMAIN_COUNTS_BY_YEAR = year_counts.swaplevel().sort_index()
+
+# Bornes du slider temporel, pour l'ensemble des œuvres et pour chaque domaine
+# (à partir des tableaux de dates déjà triés, sans nouveau regroupement)
+ALL_YEAR_BOUNDS = year_bounds(_DATES_SORTED)
+DOMAIN_YEAR_BOUNDS = {d: year_bounds(d_dates) for d, (_, d_dates) in _ROWS_BY_DOMAIN.items()}
+
+# Nombre maximal de points envoyés au navigateur pour le nuage de points d'exploration libre
+MAX_SCATTER_POINTS = 5000
+
+# Options des dropdowns d'exploration libre (les colonnes ne changent pas après le chargement)
+_ALL_OPTIONS = [{'label': c, 'value': c} for c in df.columns]
+_NUMERIC_OPTIONS = [{'label': c, 'value': c} for c in df.select_dtypes(include='number').columns]
 
 # ----------------------------
 # Définition de la barre latérale (sidebar)
 # ----------------------------
-sidebar = html.Div([
-    dbc.Card(
-        dbc.CardBody([
-            html.H5("ℹ️ Informations", className="card-title"),
-            html.Div([
-                html.P(f"Nombre total d'œuvres: {len(df)}"),
-                html.P(f"Nombre de domaines: {len(domaines)}")
+def get_sidebar():
+    """Construit la barre latérale : informations, filtre temporel et exploration libre."""
+    return html.Div([
+        dbc.Card(
+            dbc.CardBody([
+                html.H5("ℹ️ Informations", className="card-title"),
+                html.Div([
+                    html.P(f"Nombre total d'œuvres: {len(df)}"),
+                    html.P(f"Nombre de domaines: {len(domaines)}")
+                ]),
+                html.Hr(), # Ligne horizontale
+                html.H6("📅 Filtre temporel"),
+                # Slider pour filtrer les données par année
+                dcc.RangeSlider(
+                    id='year-range-slider',
+                    min=0,
+                    max=2025,
+                    value=[0, 2025], # Valeur par défaut
+                    step=1,
+                    marks={}, # Les marques seront définies dynamiquement
+                    tooltip={"placement": "bottom", "always_visible": True}
+                ),
+                html.Hr(),
+                html.H6("🔬 Exploration libre"),
+                # Dropdown pour choisir la variable X
+                dcc.Dropdown(
+                    id='x-var',
+                    options=_ALL_OPTIONS,
+                    placeholder='Variable X'
+                ),
+                # Dropdown pour choisir la variable Y
+                dcc.Dropdown(
+                    id='y-var',
+                    # Y doit être numérique, quelle que soit la variable X : options fixes,
+                    # sans callback ni aller-retour serveur
+                    options=_NUMERIC_OPTIONS,
+                    placeholder='Variable Y'
+                ),
+                html.Hr(),
+                # Bouton de réinitialisation
+                dbc.Button("🔄 Réinitialisation", id="reset-button", n_clicks=0, color='secondary', className='mt-2'),
+                html.Br(),
+                html.Hr(),
+                # Lien vers la page de carte
+                dcc.Link(
+                    dbc.Button("🗺️ Voir la carte", color="primary", className='mt-2'),
+                    href="/carte-musees",
+                    style={"textDecoration": "none"}
+                ),
             ]),
-            html.Hr(), # Ligne horizontale
-            html.H6("📅 Filtre temporel"),
-            # Slider pour filtrer les données par année
-            dcc.RangeSlider(
-                id='year-range-slider',
-                min=0,
-                max=2025,
-                value=[0, 2025], # Valeur par défaut
-                step=1,
-                marks={}, # Les marques seront définies dynamiquement
-                tooltip={"placement": "bottom", "always_visible": True}
-            ),
-            html.Hr(),
-            html.H6("🔬 Exploration libre"),
-            # Dropdown pour choisir la variable X
-            dcc.Dropdown(
-                id='x-var',
-                options=[{'label': c, 'value': c} for c in df.columns],
-                placeholder='Variable X'
-            ),
-            # Dropdown pour choisir la variable Y
-            dcc.Dropdown(
-                id='y-var',
-                options=[{'label': c, 'value': c} for c in df.columns],
-                placeholder='Variable Y'
-            ),
-            html.Hr(),
-            # Bouton de réinitialisation
-            dbc.Button("🔄 Réinitialisation", id="reset-button", n_clicks=0, color='secondary', className='mt-2'),
-            html.Br(),
-            html.Hr(),
-            # Lien vers la page de carte
-            dcc.Link(
-                dbc.Button("🗺️ Voir la carte", color="primary", className='mt-2'),
-                href="/carte-musees",
-                style={"textDecoration": "none"}
-            ),
-        ]),
-        className="h-100",
-        style={"backgroundColor": "#FFFFFF", "color": "#000000", "display": "flex", "flexDirection": "column"}
-    ),
-], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
+            className="h-100",
+            style={"backgroundColor": "#FFFFFF", "color": "#000000", "display": "flex", "flexDirection": "column"}
+        ),
+    ], style={"height": "100vh", "display": "flex", "flexDirection": "column"})
 
 # ----------------------------
 # Définition du layout principal
 # ----------------------------
-layout = dbc.Container([
-    # Lien de retour à l'accueil
-    html.Div([
-        dcc.Link(
-            dbc.Button("← Retour à l'accueil", color="outline-secondary", className="mb-3"),
-            href="/accueil",
-            style={"textDecoration": "none"}
-        ),
-    ]),
+@functools.cache
+def get_layout():
+    """
+    Construit le layout de la page, à son premier affichage seulement (et non à l'import) ;
+    le même layout est ensuite réutilisé.
+    """
+    return dbc.Container([
+        # Lien de retour à l'accueil
+        html.Div([
+            dcc.Link(
+                dbc.Button("← Retour à l'accueil", color="outline-secondary", className="mb-3"),
+                href="/accueil",
+                style={"textDecoration": "none"}
+            ),
+        ]),
     
-    # Mise en page en ligne (Row) avec la sidebar et le contenu principal
-    dbc.Row([
-        dbc.Col(sidebar, width=3, style={"height": "100vh"}), # Sidebar sur 3 colonnes
-        dbc.Col([
-            html.H1("📊 Dashboard Œuvres d'Art", style={"color": "#000000", "marginBottom": "20px"}),
-            # Titre dynamique pour le domaine sélectionné
-            html.Div(id="domain-title", style={"marginBottom": "20px"}),
-            html.Div([
-                # Boutons pour sélectionner un domaine spécifique
-                html.Div(
-                    [
-                        html.Button(
-                            domaine if pd.notna(domaine) else "Inconnu",
-                            id=f"btn-{i}",
-                            style={
-                                "margin": "4px",
-                                "padding": "6px 12px",
-                                "borderRadius": "6px",
-                                "border": "none",
-                                "backgroundColor": "#939393",
-                                "color": "#000000",
-                                "cursor": "pointer",
-                                "fontSize": "0.85rem",
-                            },
-                        )
-                        for i, domaine in enumerate(domaines)
-                    ],
-                    style={
-                        "display": "flex",
-                        "flexWrap": "wrap",
-                        "justifyContent": "start",
-                        "marginBottom": "25px",
-                    },
-                ),
-                # Graphique principal
-                dcc.Graph(id="main-graph")
-            ])
-        ], width=9) # Contenu principal sur 9 colonnes
-    ], style={"minHeight": "100vh", "backgroundColor": "#FFFFFF", "paddingTop": "20px", "height": "100vh"})
-], fluid=True, style={"height": "100vh"})
+        # Mise en page en ligne (Row) avec la sidebar et le contenu principal
+        dbc.Row([
+            dbc.Col(get_sidebar(), width=3, style={"height": "100vh"}), # Sidebar sur 3 colonnes
+            dbc.Col([
+                html.H1("📊 Dashboard Œuvres d'Art", style={"color": "#000000", "marginBottom": "20px"}),
+                # Titre dynamique pour le domaine sélectionné
+                html.Div(id="domain-title", style={"marginBottom": "20px"}),
+                html.Div([
+                    # Boutons pour sélectionner un domaine spécifique
+                    html.Div(
+                        [
+                            html.Button(
+                                domaine if pd.notna(domaine) else "Inconnu",
+                                id={"type": "domain-btn", "index": i},
+                                style={
+                                    "margin": "4px",
+                                    "padding": "6px 12px",
+                                    "borderRadius": "6px",
+                                    "border": "none",
+                                    "backgroundColor": "#939393",
+                                    "color": "#000000",
+                                    "cursor": "pointer",
+                                    "fontSize": "0.85rem",
+                                },
+                            )
+                            for i, domaine in enumerate(domaines)
+                        ],
+                        style={
+                            "display": "flex",
+                            "flexWrap": "wrap",
+                            "justifyContent": "start",
+                            "marginBottom": "25px",
+                        },
+                    ),
+                    # Graphique principal
+                    dcc.Graph(id="main-graph")
+                ])
+            ], width=9) # Contenu principal sur 9 colonnes
+        ], style={"minHeight": "100vh", "backgroundColor": "#FFFFFF", "paddingTop": "20px", "height": "100vh"})
+    ], fluid=True, style={"height": "100vh"})
 
 # ----------------------------
 # Fonctions utilitaires pour la création des graphiques
@@ -204,62 +352,57 @@ layout = dbc.Container([
 def group_ancient_dates(df, date_col, threshold):
     """
     Regroupe les dates antérieures à un seuil dans une catégorie unique.
+    Retourne un nouveau DataFrame (le DataFrame d'origine n'est pas modifié).
     """
-    df = df.copy()
-    threshold_str = str(int(threshold))
-    df["date_grouped"] = df[date_col].apply(
-        lambda x: ("Anterieur à " + threshold_str) if x < threshold else str(int(x))
-    )
-    return df
+    # Calcul vectorisé : conversion des années en texte et choix du libellé en une passe
+    dates = df[date_col].to_numpy()
+    years_str = dates.astype(np.int64).astype(str)
+    grouped = np.where(dates < threshold, f"Anterieur à {int(threshold)}", years_str)
+    return df.assign(date_grouped=grouped.astype(object))
 
+@functools.lru_cache(maxsize=256)
 def get_main_figure(pathname, year_range):
     """
     Retourne la figure Plotly appropriée en fonction de l'URL et de la plage temporelle.
     - Si une URL spécifique de domaine est fournie, affiche un graphique pour ce domaine.
     - Sinon, affiche un graphique de tous les domaines.
+    Le résultat est mémorisé par couple (URL, plage temporelle) : year_range doit
+    être un tuple pour servir de clé de cache. La figure est retournée déjà convertie
+    en dictionnaire JSON, que Dash renvoie tel quel lors des appels suivants.
     """
-    # Filtre les données selon la plage temporelle
-    df_filtered = df[(df["date_de_l_oeuvre_ou_de_l_artiste"] >= year_range[0]) &
-                     (df["date_de_l_oeuvre_ou_de_l_artiste"] <= year_range[1])]
-    
     # Vérifie si l'URL spécifie un domaine particulier
     if pathname.startswith("/dashboard-oeuvres/") and pathname != "/dashboard-oeuvres":
         # Extrait le nom du domaine de l'URL (et remplace les espaces encodées)
         domaine = pathname.split("/dashboard-oeuvres/")[1].replace("%20", " ")
         
-        # FILTRE les données pour ce domaine seulement
-        df_domaine = df_filtered[df_filtered["domaine"] == domaine].copy()
+        # Découpe la ligne du domaine dans la matrice (domaine × année) selon la plage
+        # temporelle (les œuvres sans date n'y figurent pas)
+        row = _DOMAIN_ROW.get(domaine)
+        lo = max(year_range[0] - FIRST_YEAR, 0)
+        hi = min(year_range[1] - FIRST_YEAR + 1, YEAR_COUNTS_MATRIX.shape[1])
+        counts_by_year = YEAR_COUNTS_MATRIX[row, lo:hi] if row is not None and lo < hi else np.empty(0, np.int32)
+        years_present = np.flatnonzero(counts_by_year)
         
-        if df_domaine.empty:
+        if years_present.size == 0:
             # Si aucune donnée pour ce domaine, affiche un graphique vide
-            return px.scatter(title=f"Aucune donnée pour {domaine} dans cette plage")
-        
-        # Analyse par siècle pour le domaine sélectionné
-        df_domaine = df_domaine.dropna(subset=["date_de_l_oeuvre_ou_de_l_artiste"])
-        
-        if df_domaine.empty:
-            # Si aucune date valide, affiche un graphique vide
-            return px.scatter(title=f"Aucune date disponible pour {domaine} dans cette plage")
+            return px.scatter(title=f"Aucune donnée pour {domaine} dans cette plage").to_plotly_json()
         
         # Calcul des siècles
-        min_year = df_domaine["date_de_l_oeuvre_ou_de_l_artiste"].min()
-        max_year = df_domaine["date_de_l_oeuvre_ou_de_l_artiste"].max()
+        min_year = FIRST_YEAR + lo + years_present[0]
+        max_year = FIRST_YEAR + lo + years_present[-1]
         
         start_century = (int(min_year) // 100) * 100
         end_century = (int(max_year) // 100 + 1) * 100
-        bins = list(range(start_century, end_century + 100, 100))
-        labels = [f"{b}-{b+99}" for b in bins[:-1]]
-        
-        df_domaine["siecle"] = pd.cut(
-            df_domaine["date_de_l_oeuvre_ou_de_l_artiste"], 
-            bins=bins, 
-            labels=labels, 
-            right=False
-        )
+        labels = [f"{b}-{b+99}" for b in range(start_century, end_century, 100)]
         
-        # Compte le nombre d'œuvres par siècle
-        counts_by_century = df_domaine["siecle"].value_counts().sort_index().reset_index()
-        counts_by_century.columns = ["siecle", "nombre_d_oeuvres"]
+        # Compte le nombre d'œuvres par siècle (somme des comptes annuels)
+        years = np.arange(min_year, max_year + 1)
+        counts = counts_by_year[years_present[0]:years_present[-1] + 1]
+        per_century = np.bincount((years - start_century) // 100, weights=counts, minlength=len(labels))
+        counts_by_century = pd.DataFrame({
+            "siecle": pd.Categorical(labels, categories=labels, ordered=True),
+            "nombre_d_oeuvres": per_century.astype(np.int64),
+        })
         
         # Crée un graphique à barres
         fig = px.bar(
@@ -273,13 +416,16 @@ def get_main_figure(pathname, year_range):
         )
     
     else:
-        # Vue générale - tous les domaines
-        if df_filtered.empty:
+        # Vue générale - tous les domaines : découpe la table (année, domaine) précalculée
+        counts_in_range = DOMAIN_COUNTS_BY_YEAR.loc[year_range[0]:year_range[1]]
+        if counts_in_range.empty:
             # Si aucune donnée filtrée, graphique vide
             fig = px.bar(title="Aucune donnée disponible dans cette plage")
         else:
-            # Compte le nombre d'œuvres par domaine
-            counts_filtered = df_filtered["domaine"].value_counts().reset_index()
+            # Compte le nombre d'œuvres par domaine, par nombre décroissant puis par nom
+            # en cas d'égalité (tri stable sur l'index déjà alphabétique du groupby)
+            counts_filtered = (counts_in_range.groupby(level="domaine", observed=True).sum()
+                               .sort_values(ascending=False, kind="stable").reset_index())
             counts_filtered.columns = ["domaine", "nombre_d_oeuvres"]
             # Crée un graphique à barres
             fig = px.bar(
@@ -301,7 +447,45 @@ def get_main_figure(pathname, year_range):
         showlegend=False,
         margin=dict(b=150, t=60),
     )
-    return fig
+    return fig.to_plotly_json()
+
+@functools.lru_cache(maxsize=64)
+def get_slider_settings(pathname):
+    """
+    Retourne les paramètres du slider temporel (marques, min, max, valeur, pas)
+    pour l'URL donnée. Ils ne dépendent que de l'URL et sont mémorisés.
+    """
+    # Bornes précalculées selon l'URL (domaine spécifique ou général) ;
+    # valeurs par défaut si le domaine n'a aucune date
+    if pathname.startswith("/dashboard-oeuvres/") and pathname != "/dashboard-oeuvres":
+        domaine = pathname.split("/dashboard-oeuvres/")[1].replace("%20", " ")
+        min_year, max_year = DOMAIN_YEAR_BOUNDS.get(domaine, (0, 2025))
+    else:
+        min_year, max_year = ALL_YEAR_BOUNDS
+
+    span = max_year - min_year
+    # Définit le pas en fonction de l'étendue des dates
+    if span <= 100:
+        step = 1
+    elif span <= 500:
+        step = 10
+    elif span <= 2000:
+        step = 50
+    else:
+        step = 100
+
+    # Calcule les marques à afficher sur le slider
+    num_marks = min(10, max(2, span // step + 1))
+    step_marks = max(200, span // (num_marks - 1)) if span > 0 else 1
+    step_marks = step_marks // step * step if step > 0 else step_marks
+
+    years = np.arange(min_year, max_year + 1, step_marks).tolist()
+    marks = dict(zip(years, map(str, years)))
+
+    marks[min_year] = str(min_year)
+    marks[max_year] = str(max_year)
+
+    return marks, min_year, max_year, [min_year, max_year], step
 
 # ----------------------------
 # Définition des callbacks
@@ -312,33 +496,38 @@ def register_callbacks(app):
     Enregistre tous les callbacks de l'application Dash.
     Ces callbacks gèrent l'interaction entre les composants de l'interface.
     """
-    
-    # Callback pour la navigation (changement d'URL)
-    @app.callback(
+    # Callback pour la navigation (changement d'URL), exécuté dans le navigateur :
+    # associer un bouton à une URL ne demande aucune donnée, donc aucun aller-retour serveur
+    app.clientside_callback(
+        """
+        function(domainClicks, resetClicks) {
+            // Identifiant du composant déclencheur (JSON pour un bouton de domaine)
+            const triggered = dash_clientside.callback_context.triggered;
+            if (!triggered.length) {
+                return dash_clientside.no_update;
+            }
+            const propId = triggered[0].prop_id;
+            const triggerId = propId.slice(0, propId.lastIndexOf("."));
+
+            // Si c'est le bouton de réinitialisation : retour à la vue générale
+            if (triggerId === "reset-button") {
+                return "/dashboard-oeuvres";
+            }
+
+            // Si c'est un bouton de domaine : redirige vers le domaine (espaces encodés)
+            const domaines = %s;
+            const id = JSON.parse(triggerId);
+            if (id.type === "domain-btn") {
+                return "/dashboard-oeuvres/" + domaines[id.index].split(" ").join("%%20");
+            }
+            return dash_clientside.no_update;
+        }
+        """ % json.dumps(domaines),
         Output('url', 'pathname'), # Met à jour l'URL
-        [Input(f'btn-{i}', 'n_clicks') for i in range(len(domaines))], # Boutons de domaine
+        Input({"type": "domain-btn", "index": ALL}, 'n_clicks'), # Tous les boutons de domaine
         Input("reset-button", "n_clicks"), # Bouton de réinitialisation
         prevent_initial_call=True
     )
-    def redirect(*args):
-        ctx = callback_context
-        if not ctx.triggered:
-            return dash.no_update
-        
-        trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        
-        # Si c'est le bouton de réinitialisation
-        if trigger_id == "reset-button":
-            return "/dashboard-oeuvres" # Retourne à la vue générale
-        
-        # Si c'est un bouton de domaine
-        if trigger_id.startswith('btn-'):
-            index = int(trigger_id.split('-')[1])
-            domaine = domaines[index]
-            domaine_encoded = domaine.replace(" ", "%20") # Encode les espaces pour l'URL
-            return f"/dashboard-oeuvres/{domaine_encoded}" # Redirige vers le domaine
-        
-        return dash.no_update
 
     # Callback pour mettre à jour le titre du domaine affiché
     @app.callback(
@@ -347,15 +536,11 @@ def register_callbacks(app):
         Input("year-range-slider", "value") # Utilise la plage temporelle
     )
     def update_domain_title(pathname, year_range):
-        # Filtre les données selon la plage temporelle
-        df_filtered = df[(df["date_de_l_oeuvre_ou_de_l_artiste"] >= year_range[0]) &
-                         (df["date_de_l_oeuvre_ou_de_l_artiste"] <= year_range[1])]
-        
         # Vérifie si l'URL spécifie un domaine particulier
         if pathname.startswith("/dashboard-oeuvres/") and pathname != "/dashboard-oeuvres":
             domaine = pathname.split("/dashboard-oeuvres/")[1].replace("%20", " ")
-            df_domaine = df_filtered[df_filtered["domaine"] == domaine]
-            count_oeuvres = len(df_domaine)
+            # Nombre d'œuvres du domaine dans la plage temporelle (recherche dichotomique)
+            count_oeuvres = _count_by_year(year_range[0], year_range[1], domaine)
             return html.Div([
                 html.H2(f"Domaine : {domaine}", 
                        style={"color": "#000000", "fontSize": "1.5rem", "marginBottom": "5px"}),
@@ -363,7 +548,7 @@ def register_callbacks(app):
                       style={"color": "#666666", "fontSize": "1rem", "marginBottom": "20px"})
             ])
         else:
-            count_total = len(df_filtered)
+            count_total = _count_by_year(year_range[0], year_range[1])
             return html.Div([
                 html.H2("Vue d'ensemble de tous les domaines", 
                        style={"color": "#000000", "fontSize": "1.5rem", "marginBottom": "5px"}),
@@ -381,62 +566,8 @@ def register_callbacks(app):
         Input("url", "pathname") # L'URL détermine le jeu de données à analyser
     )
     def update_slider(pathname):
-        # Filtre les données selon l'URL (domaine spécifique ou général)
-        if pathname.startswith("/dashboard-oeuvres/") and pathname != "/dashboard-oeuvres":
-            domaine = pathname.split("/dashboard-oeuvres/")[1].replace("%20", " ")
-            subset = df[df["domaine"] == domaine].dropna(subset=["date_de_l_oeuvre_ou_de_l_artiste"])
-        else:
-            subset = df.dropna(subset=["date_de_l_oeuvre_ou_de_l_artiste"])
-
-        if subset.empty:
-            # Si aucune donnée, définit des valeurs par défaut
-            min_year, max_year = 0, 2025
-        else:
-            # Calcule les bornes en fonction des données
-            min_raw = int(np.percentile(subset["date_de_l_oeuvre_ou_de_l_artiste"], 5))
-            min_year = min_raw // 100 * 100 # Arrondi à la centaine inférieure
-            max_year = min(int(subset["date_de_l_oeuvre_ou_de_l_artiste"].max()), 2025)
-
-        span = max_year - min_year
-        # Définit le pas en fonction de l'étendue des dates
-        if span <= 100:
-            step = 1
-        elif span <= 500:
-            step = 10
-        elif span <= 2000:
-            step = 50
-        else:
-            step = 100
-
-        # Calcule les marques à afficher sur le slider
-        num_marks = min(10, max(2, span // step + 1))
-        step_marks = max(200, span // (num_marks - 1)) if span > 0 else 1
-        step_marks = step_marks // step * step if step > 0 else step_marks
-
-        marks = {}
-        for year in range(min_year, max_year + 1, step_marks):
-            marks[year] = str(year)
-
-        marks[min_year] = str(min_year)
-        marks[max_year] = str(max_year)
-
-        return marks, min_year, max_year, [min_year, max_year], step
-
-    # Callback pour filtrer les options du dropdown Y en fonction de X
-    @app.callback(
-        Output("y-var", "options"), # Met à jour les options du dropdown Y
-        Input("x-var", "value") # La valeur du dropdown X
-    )
-    def filter_y_options(x_col):
-        if not x_col:
-            # Si X n'est pas sélectionné, montre toutes les colonnes numériques
-            return [{'label': c, 'value': c} for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
-        # Si X est numérique, Y doit aussi être numérique
-        if pd.api.types.is_numeric_dtype(df[x_col]):
-            return [{'label': c, 'value': c} for c in df.select_dtypes(include='number').columns]
-        else:
-            # Si X est non numérique, Y doit être numérique
-            return [{'label': c, 'value': c} for c in df.select_dtypes(include='number').columns]
+        # Paramètres mémorisés par URL (domaine spécifique ou vue générale)
+        return get_slider_settings(pathname)
 
     # Callback principal pour mettre à jour le graphique principal
     @app.callback(
@@ -444,22 +575,39 @@ def register_callbacks(app):
         Input("x-var", "value"), # Variable X pour l'exploration libre
         Input("y-var", "value"), # Variable Y pour l'exploration libre
         Input("url", "pathname"), # L'URL pour savoir quel domaine afficher
-        Input("year-range-slider", "value") # La plage temporelle
+        Input("year-range-slider", "value"), # La plage temporelle
+        State("main-graph", "figure") # Figure affichée (pour une mise à jour partielle)
     )
-    def update_main_graph(x_col, y_col, pathname, year_range):
-        # Filtre les données selon la plage temporelle
-        df_filtered = df[(df["date_de_l_oeuvre_ou_de_l_artiste"] >= year_range[0]) &
-                         (df["date_de_l_oeuvre_ou_de_l_artiste"] <= year_range[1])]
-        
-        # Si une URL spécifique de domaine est active, filtre les données pour ce domaine
+    def update_main_graph(x_col, y_col, pathname, year_range, current_figure):
+        # Filtre les données selon la plage temporelle et, si une URL spécifique
+        # de domaine est active, selon ce domaine
+        domaine = None
         if pathname.startswith("/dashboard-oeuvres/") and pathname != "/dashboard-oeuvres":
             domaine = pathname.split("/dashboard-oeuvres/")[1].replace("%20", " ")
-            df_filtered = df_filtered[df_filtered["domaine"] == domaine]
+        df_filtered = _slice_by_year(year_range[0], year_range[1], domaine)
         
         # Si les variables X et Y sont sélectionnées, crée un graphique d'exploration libre
         if x_col and y_col:
             try:
-                fig = px.scatter(df_filtered, x=x_col, y=y_col)
+                # Au-delà de MAX_SCATTER_POINTS œuvres, on affiche un échantillon aléatoire
+                # (reproductible) : la taille de la figure JSON reste bornée
+                title = None
+                if len(df_filtered) > MAX_SCATTER_POINTS:
+                    title = f"Échantillon de {MAX_SCATTER_POINTS} œuvres sur {len(df_filtered)}"
+                    df_filtered = df_filtered.sample(MAX_SCATTER_POINTS, random_state=0)
+                # Seul le slider a bougé : le nuage affiché reste le même (variables X et Y
+                # inchangées), on ne renvoie que les nouveaux points et le titre.
+                # La figure affichée doit avoir une trace à modifier : après une figure
+                # de repli (sans trace), on reconstruit la figure complète
+                has_trace = bool(current_figure and current_figure.get("data"))
+                if callback_context.triggered_id == "year-range-slider" and has_trace:
+                    patch = dash.Patch()
+                    patch["data"][0]["x"] = df_filtered[x_col].tolist()
+                    patch["data"][0]["y"] = df_filtered[y_col].tolist()
+                    patch["layout"]["title"]["text"] = title
+                    return patch
+                # Rendu WebGL (scattergl) : les points sont dessinés sur un canvas plutôt qu'en SVG
+                fig = px.scatter(df_filtered, x=x_col, y=y_col, render_mode="webgl", title=title)
                 fig.update_layout(
                     plot_bgcolor="#FFFFFF",
                     paper_bgcolor="#FFFFFF",
@@ -474,4 +622,4 @@ def register_callbacks(app):
                 return px.scatter(title="Impossible de créer le graphique")
 
         # Sinon, utilise la logique basée sur l'URL (vue générale ou spécifique)
-        return get_main_figure(pathname, year_range)
+        return get_main_figure(pathname, tuple(year_range))
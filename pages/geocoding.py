@@ -1,7 +1,10 @@
 import pandas as pd
 from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
+from geopy.adapters import AioHTTPAdapter
+from geopy.extra.rate_limiter import AsyncRateLimiter
 from pathlib import Path
+import asyncio
+import shelve
 
 # -----------------------------
 # 🔹 Chargement du CSV
@@ -12,18 +15,14 @@ df = pd.read_csv(csv_path, sep=";", encoding="utf-8")
 # -----------------------------
 # 🔹 Extraction de la ville
 # -----------------------------
-def extract_city(loc):
-    if pd.isna(loc):
-        return None
-    # Supprimer le type (musée >, palais >, etc.)
-    if ">" in loc:
-        loc = loc.split(">", 1)[1].strip()
-    parts = [p.strip() for p in loc.split(",")]
-    if len(parts) >= 2:
-        return parts[1]  # On garde la ville
-    return None
+def extract_city(lieux):
+    # Traitement vectorisé de toute la colonne (accesseur .str), valeurs manquantes conservées
+    # Supprimer le type (musée >, palais >, etc.) : on garde ce qui suit le premier ">"
+    lieux = lieux.str.split(">", n=1).str[-1]
+    # On garde la ville (2e élément séparé par des virgules), absente s'il n'y en a qu'un
+    return lieux.str.split(",", n=2).str[1].str.strip()
 
-df["ville"] = df["lieu de conservation"].apply(extract_city)
+df["ville"] = extract_city(df["lieu de conservation"])
 
 # -----------------------------
 # 🔹 Dictionnaire manuel pour villes célèbres ou ambiguës
@@ -45,13 +44,20 @@ manual_fix_villes = {
 # -----------------------------
 # 🔹 Setup Geocoder
 # -----------------------------
-geolocator = Nominatim(user_agent="musee_geocoder", timeout=10)
-geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1, max_retries=3, error_wait_seconds=5)
+# Délai minimal entre deux requêtes et nombre maximal de requêtes en cours : 1 s et
+# une seule requête à la fois pour le serveur public de Nominatim (client unique,
+# 1 requête/s maximum) ; à modifier seulement pour une instance privée ou un fournisseur payant
+MIN_DELAY_SECONDS = 1
+MAX_CONCURRENT_REQUESTS = 1
+
+# Cache disque des résultats (ville -> (lat, lon)), conservé d'une exécution à l'autre :
+# seules les villes jamais géocodées sont envoyées à Nominatim
+cache_path = csv_path.parent / "geocode_cache"
 
 # -----------------------------
 # 🔹 Fonction pour géocoder une ville
 # -----------------------------
-def get_city_coordinates(city, country=None):
+async def get_city_coordinates(city, geocode, semaphore, country=None, cache=None):
     if city is None:
         return None, None
     key = f"{city}, {country}" if country else city
@@ -60,15 +66,27 @@ def get_city_coordinates(city, country=None):
         lat, lon = manual_fix_villes[city]
         print(f"MANUAL FIX: {city} => {lat}, {lon}")
         return lat, lon
+    # Vérifier dans le cache disque (y compris les villes introuvables)
+    if cache is not None and key in cache:
+        lat, lon = cache[key]
+        print(f"CACHE: {city} => {lat}, {lon}")
+        return lat, lon
     try:
         query = key
-        location = geocode(query)
+        # Au plus MAX_CONCURRENT_REQUESTS requêtes en cours à la fois
+        async with semaphore:
+            location = await geocode(query)
         if location:
             print(f"OK: {city} => {location.latitude}, {location.longitude}")
-            return location.latitude, location.longitude
+            coords = location.latitude, location.longitude
         else:
             print(f"NOT FOUND: {city}")
-            return None, None
+            coords = None, None
+        # Les erreurs réseau ne sont pas mises en cache : elles seront retentées
+        if cache is not None:
+            cache[key] = coords
+            cache.sync()
+        return coords
     except Exception as e:
         print(f"ERROR: {city} => {e}")
         return None, None
@@ -76,12 +94,25 @@ def get_city_coordinates(city, country=None):
 # -----------------------------
 # 🔹 Géocodage des villes uniques
 # -----------------------------
+async def geocode_cities(villes, cache):
+    # Requêtes asynchrones sur une seule session HTTP (connexion réutilisée) : le limiteur
+    # espace les départs de MIN_DELAY_SECONDS et le sémaphore borne les requêtes en cours
+    # (une seule par défaut : la suivante part après la réponse et le délai minimal)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with Nominatim(user_agent="musee_geocoder", timeout=10, adapter_factory=AioHTTPAdapter) as geolocator:
+        geocode = AsyncRateLimiter(
+            geolocator.geocode, min_delay_seconds=MIN_DELAY_SECONDS,
+            max_retries=3, error_wait_seconds=5, swallow_exceptions=False,
+        )
+        coords = await asyncio.gather(
+            *(get_city_coordinates(ville, geocode, semaphore, cache=cache) for ville in villes)  # pas besoin de forcer France
+        )
+    return dict(zip(villes, coords))
+
 villes_unique = df["ville"].dropna().unique()
-coords_dict = {}
 
-for ville in villes_unique:
-    lat, lon = get_city_coordinates(ville)  # pas besoin de forcer France
-    coords_dict[ville] = (lat, lon)
+with shelve.open(str(cache_path)) as geo_cache:
+    coords_dict = asyncio.run(geocode_cities(villes_unique, geo_cache))
 
 # -----------------------------
 # 🔹 Ajouter les coordonnées de la ville à chaque musée